@@ -15,12 +15,21 @@ CREATE TABLE IF NOT EXISTS player_aliases (
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
 
+CREATE TABLE IF NOT EXISTS players (
+    id SERIAL PRIMARY KEY,
+    name VARCHAR(255) NOT NULL UNIQUE
+);
+
 CREATE TABLE IF NOT EXISTS player_sessions (
     id SERIAL PRIMARY KEY,
-    player_name VARCHAR(255) NOT NULL,
-    login_time TIMESTAMP NOT NULL,
+    user_id INTEGER NOT NULL REFERENCES players(id),
+    login_time TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
     logout_time TIMESTAMP,
-    duration_seconds INTEGER,
+    duration_seconds INTEGER GENERATED ALWAYS AS (EXTRACT(EPOCH FROM (logout_time - login_time))::int) STORED,
+    -- Opaque per-session payload (rich presence, last position, etc.).
+    -- Stored as jsonb, not json/text, so it stays compact and can be
+    -- indexed later with: CREATE INDEX ... ON player_sessions USING gin(meta);
+    meta JSONB,
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
 
@@ -41,9 +50,30 @@ CREATE TABLE IF NOT EXISTS bundle_items (
 );
 
 -- Create indexes for better performance
-CREATE INDEX IF NOT EXISTS idx_player_name ON player_sessions(player_name);
 CREATE INDEX IF NOT EXISTS idx_login_time ON player_sessions(login_time);
 CREATE INDEX IF NOT EXISTS idx_logout_time ON player_sessions(logout_time);
+CREATE INDEX IF NOT EXISTS idx_player_sessions_user_logout ON player_sessions(user_id, logout_time) WHERE logout_time IS NOT NULL;
+CREATE INDEX IF NOT EXISTS idx_player_sessions_open ON player_sessions(user_id, login_time DESC) WHERE logout_time IS NULL;
+CREATE INDEX IF NOT EXISTS idx_bundle_items_bundle_id ON bundle_items(bundle_id);
+
+-- Upgrading from the 1.0.0 schema
+-- ================================
+-- The Python script runs this migration automatically on first connect.
+-- To apply it by hand instead, run the statements below; they preserve
+-- existing session rows. Skip this section for fresh installs.
+--
+-- INSERT INTO players (name)
+--     SELECT DISTINCT player_name FROM player_sessions
+--     ON CONFLICT (name) DO NOTHING;
+-- ALTER TABLE player_sessions ADD COLUMN user_id INTEGER REFERENCES players(id);
+-- UPDATE player_sessions s SET user_id = p.id FROM players p WHERE p.name = s.player_name;
+-- ALTER TABLE player_sessions ALTER COLUMN user_id SET NOT NULL;
+-- ALTER TABLE player_sessions DROP COLUMN player_name;  -- also drops idx_player_name
+-- ALTER TABLE player_sessions ALTER COLUMN login_time SET DEFAULT CURRENT_TIMESTAMP;
+-- ALTER TABLE player_sessions DROP COLUMN duration_seconds;
+-- ALTER TABLE player_sessions ADD COLUMN duration_seconds INTEGER
+--     GENERATED ALWAYS AS (EXTRACT(EPOCH FROM (logout_time - login_time))::int) STORED;
+-- ALTER TABLE player_sessions ADD COLUMN meta JSONB;
 
 -- Grant permissions (optional - adjust username as needed)
 -- GRANT ALL PRIVILEGES ON DATABASE "7dtd" TO your_username;